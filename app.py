@@ -4,6 +4,8 @@ from flask_cors import CORS
 from datetime import datetime, date
 import os
 from dotenv import load_dotenv
+from similarity import SimilarityIndex, parse_tags
+from dedup import DuplicateDetector
 
 load_dotenv()
 
@@ -20,6 +22,12 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 db = SQLAlchemy(app)
 
+# Precomputed "similar jobs" neighbours, kept in sync by the write routes
+similar_jobs_index = SimilarityIndex(k=int(os.getenv('SIMILAR_JOBS_K', 10)))
+
+# MinHash/LSH index of existing postings, persisted next to the database
+duplicate_detector = DuplicateDetector()
+
 # CORS configuration for production - UPDATED FOR YOUR DOMAINS
 CORS(app, origins=[
     "http://localhost:5173",  # Development
@@ -58,9 +66,56 @@ class Job(db.Model):
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
 
+def duplicate_index_path():
+    """Store the LSH index beside the SQLite file, or in the instance folder"""
+    if os.getenv('DEDUP_INDEX_PATH'):
+        return os.getenv('DEDUP_INDEX_PATH')
+    url = db.engine.url
+    if url.get_backend_name() == 'sqlite' and url.database and url.database != ':memory:':
+        return os.path.splitext(url.database)[0] + '.lsh.json'
+    os.makedirs(app.instance_path, exist_ok=True)
+    return os.path.join(app.instance_path, 'jobs.lsh.json')
+
+def merge_duplicate(job, data):
+    """Fold a re-posted job into the existing one instead of creating a copy"""
+    tags = parse_tags(job.tags)
+    tags += [tag for tag in parse_tags(data.get('tags')) if tag not in tags]
+    job.tags = str(tags)
+    if not job.description and data.get('description'):
+        job.description = data['description']
+    if not job.salary and data.get('salary'):
+        job.salary = data['salary']
+    job.updated_at = datetime.utcnow()
+
+def index_job(job, similar=True, duplicates=True):
+    """Refresh the job indexes after a commit; failures are logged, not raised"""
+    try:
+        if similar:
+            similar_jobs_index.upsert(job)
+        if duplicates:
+            duplicate_detector.add(job.to_dict())
+    except Exception:
+        app.logger.exception('Failed to index job %s', job.id)
+
+def unindex_job(job_id):
+    try:
+        similar_jobs_index.remove(job_id)
+        duplicate_detector.remove(job_id)
+    except Exception:
+        app.logger.exception('Failed to unindex job %s', job_id)
+
 # Create tables
 with app.app_context():
     db.create_all()
+    similar_jobs_index.rebuild(db.session.query(Job.id, Job.title, Job.tags).all())
+    
+    duplicate_detector.path = duplicate_index_path()
+    job_ids = {job_id for (job_id,) in db.session.query(Job.id)}
+    if not duplicate_detector.load() or duplicate_detector.ids() != job_ids:
+        duplicate_detector.rebuild(
+            row._asdict()
+            for row in db.session.query(Job.id, Job.title, Job.company, Job.location, Job.description)
+        )
 
 # Routes
 @app.route('/api/jobs', methods=['GET'])
@@ -115,6 +170,29 @@ def get_job(job_id):
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
+@app.route('/api/jobs/<int:job_id>/similar', methods=['GET'])
+def get_similar_jobs(job_id):
+    try:
+        job = Job.query.get_or_404(job_id)
+        limit = request.args.get('limit', similar_jobs_index.k, type=int)
+        if limit < 1:
+            return jsonify({'error': 'limit must be at least 1'}), 400
+        limit = min(limit, similar_jobs_index.k)
+        
+        # Jobs written by another process (e.g. a manual DB import) are indexed on demand
+        if job.id not in similar_jobs_index:
+            similar_jobs_index.upsert(job)
+        
+        neighbours = similar_jobs_index.neighbours(job.id, limit)
+        jobs_by_id = {j.id: j for j in Job.query.filter(Job.id.in_([i for i, _ in neighbours])).all()}
+        
+        return jsonify([
+            {**jobs_by_id[i].to_dict(), 'similarity': round(score, 4)}
+            for i, score in neighbours if i in jobs_by_id
+        ])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 404
+
 @app.route('/api/jobs', methods=['POST'])
 def create_job():
     try:
@@ -138,8 +216,25 @@ def create_job():
             salary=data.get('salary')
         )
         
+        # Merge near-duplicate reposts into the existing job unless the caller opts out
+        duplicate_id = None
+        if request.args.get('allow_duplicate') not in ('1', 'true'):
+            try:
+                duplicate_id = duplicate_detector.find_duplicate(data)
+            except Exception:
+                app.logger.exception('Duplicate lookup failed')
+        if duplicate_id is not None:
+            existing = db.session.get(Job, duplicate_id)
+            if existing is not None:
+                merge_duplicate(existing, data)
+                db.session.commit()
+                index_job(existing)
+                return jsonify({**existing.to_dict(), 'duplicate_of': existing.id}), 200
+            unindex_job(duplicate_id)
+        
         db.session.add(job)
         db.session.commit()
+        index_job(job)
         
         return jsonify(job.to_dict()), 201
     
@@ -173,6 +268,11 @@ def update_job(job_id):
         
         job.updated_at = datetime.utcnow()
         db.session.commit()
+        index_job(
+            job,
+            similar='title' in data or 'tags' in data,
+            duplicates=any(field in data for field in ('title', 'company', 'location', 'description'))
+        )
         
         return jsonify(job.to_dict())
     
@@ -186,6 +286,7 @@ def delete_job(job_id):
         job = Job.query.get_or_404(job_id)
         db.session.delete(job)
         db.session.commit()
+        unindex_job(job_id)
         
         return jsonify({'message': 'Job deleted successfully'}), 200
     
@@ -211,6 +312,7 @@ def root():
         'status': 'running',
         'endpoints': {
             'jobs': '/api/jobs',
+            'similar_jobs': '/api/jobs/<id>/similar',
             'health': '/api/health',
             'docs': 'https://github.com/fahadnasir13/actuaryhub'
         },
@@ -0,0 +1,316 @@
+"""
+Near-duplicate detection for job postings.
+
+Every job is reduced to a MinHash signature over shingles of its title,
+company, location and description. Signatures are split into LSH bands and
+bucketed, so finding candidate duplicates only touches jobs that share a
+bucket instead of scanning the whole table. Candidates must then have the
+same company and location and an equivalent title.
+
+The index is persisted as an append-only log of JSON lines next to the
+database, so each write costs one appended line. Buckets are rebuilt from
+the signatures on load and the log is compacted when it grows stale.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import zlib
+
+import numpy as np
+
+NUM_PERM = 128
+BANDS = 32
+SEED = 1
+# Bump whenever shingling changes so persisted signatures are rebuilt
+VERSION = 2
+
+# Minimum estimated Jaccard similarity of the full shingle sets
+SIMILARITY_THRESHOLD = 0.4
+# Minimum Jaccard similarity of the normalised title tokens
+TITLE_THRESHOLD = 0.7
+
+# Title, company and location decide a duplicate; the description only
+# contributes a small sample so boilerplate text can't outvote them
+TITLE_WEIGHT = 4
+COMPANY_WEIGHT = 3
+LOCATION_WEIGHT = 2
+DESCRIPTION_SHINGLES = 4
+
+# Compact the log once it holds this many times more records than jobs
+COMPACT_FACTOR = 2
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+ABBREVIATIONS = {
+    'sr': 'senior',
+    'jr': 'junior',
+    'snr': 'senior',
+    'mgr': 'manager',
+    'assoc': 'associate',
+    'asst': 'assistant',
+    'dir': 'director',
+    'vp': 'vice president',
+}
+STOPWORDS = {'a', 'an', 'and', 'at', 'for', 'in', 'of', 'the', 'to', 'with'}
+LEGAL_SUFFIXES = {'inc', 'incorporated', 'llc', 'llp', 'lp', 'ltd', 'limited', 'corp', 'corporation', 'plc', 'co'}
+
+# Titles that differ in any of these words are different jobs
+SENIORITY_WORDS = {'senior', 'junior', 'lead', 'principal', 'chief', 'head', 'entry', 'staff', 'vice', 'president'}
+ROLE_WORDS = {
+    'actuary', 'analyst', 'consultant', 'specialist', 'modeler', 'scientist', 'manager', 'director',
+    'officer', 'associate', 'assistant', 'engineer', 'developer', 'underwriter', 'student', 'intern',
+}
+KEY_TITLE_WORDS = SENIORITY_WORDS | ROLE_WORDS
+# Words a repost may add or drop without becoming a different job
+FILLER_TITLE_WORDS = {'insurance', 'position', 'role', 'opening', 'opportunity', 'job', 'new', 'hiring', 'urgent'}
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalise_tokens(text):
+    """Lower-case, tokenize and expand common abbreviations"""
+    tokens = []
+    for token in TOKEN_RE.findall((text or '').lower()):
+        tokens.extend(ABBREVIATIONS.get(token, token).split())
+    return [token for token in tokens if token not in STOPWORDS]
+
+
+def normalise_company(company):
+    """Normalise a company name, dropping trailing legal suffixes like Inc or Ltd"""
+    tokens = normalise_tokens(company)
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def normalise_location(location):
+    return ' '.join(normalise_tokens(location))
+
+
+def shingles(job):
+    """Build the weighted shingle set for a job dict"""
+    result = set()
+    for token in set(normalise_tokens(job.get('title'))):
+        result.update(f'title:{token}:{i}' for i in range(TITLE_WEIGHT))
+    company = normalise_company(job.get('company'))
+    if company:
+        result.update(f'company:{company}:{i}' for i in range(COMPANY_WEIGHT))
+    location = normalise_location(job.get('location'))
+    if location:
+        result.update(f'location:{location}:{i}' for i in range(LOCATION_WEIGHT))
+
+    # Bottom-k sample of description trigrams: consistent between similar texts
+    words = normalise_tokens(job.get('description'))
+    trigrams = {'description:' + ' '.join(words[i:i + 3]) for i in range(len(words) - 2)}
+    result.update(sorted(trigrams, key=lambda s: zlib.crc32(s.encode('utf-8')))[:DESCRIPTION_SHINGLES])
+    return result
+
+
+def jaccard(a, b):
+    a, b = set(a), set(b)
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def titles_match(a, b):
+    """Titles match if they share seniority and role words and differ only in filler"""
+    a, b = set(a), set(b)
+    return (
+        a & KEY_TITLE_WORDS == b & KEY_TITLE_WORDS
+        and (a ^ b) <= FILLER_TITLE_WORDS
+        and jaccard(a, b) >= TITLE_THRESHOLD
+    )
+
+
+class DuplicateDetector:
+    def __init__(self, path=None, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._lock = threading.RLock()
+
+        # Fixed seed so persisted signatures stay valid across restarts
+        generator = np.random.RandomState(SEED)
+        self._a = generator.randint(1, 1 << 61, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 61, size=num_perm, dtype=np.uint64)
+
+        self._entries = {}   # job id -> {'signature', 'company', 'location', 'title'}
+        self._buckets = {}   # 'band:hash' -> set of job ids
+
+    def __contains__(self, job_id):
+        return job_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def ids(self):
+        return set(self._entries)
+
+    def signature(self, job):
+        """Compute the MinHash signature of a job dict"""
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in shingles(job)], dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        permuted = (self._a[:, np.newaxis] * hashes + self._b[:, np.newaxis]) % _MERSENNE_PRIME
+        return np.bitwise_and(permuted, _MAX_HASH).min(axis=1)
+
+    def _band_keys(self, signature):
+        return [
+            f'{band}:{signature[band * self.rows:(band + 1) * self.rows].tobytes().hex()}'
+            for band in range(self.bands)
+        ]
+
+    def _index(self, job_id, entry):
+        self._unindex(job_id)
+        self._entries[job_id] = entry
+        for key in self._band_keys(entry['signature']):
+            self._buckets.setdefault(key, set()).add(job_id)
+
+    def _unindex(self, job_id):
+        entry = self._entries.pop(job_id, None)
+        if entry is None:
+            return False
+        for key in self._band_keys(entry['signature']):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(job_id)
+                if not bucket:
+                    del self._buckets[key]
+        return True
+
+    def _entry(self, job):
+        return {
+            'signature': self.signature(job),
+            'company': normalise_company(job.get('company')),
+            'location': normalise_location(job.get('location')),
+            'title': normalise_tokens(job.get('title')),
+        }
+
+    def add(self, job):
+        """Index a job dict (must include 'id'), replacing any previous entry"""
+        entry = self._entry(job)
+        with self._lock:
+            self._index(job['id'], entry)
+            self._append({'op': 'add', 'id': job['id'], **self._serialise(entry)})
+
+    def remove(self, job_id):
+        with self._lock:
+            if self._unindex(job_id):
+                self._append({'op': 'remove', 'id': job_id})
+
+    def find_duplicate(self, job, exclude=None):
+        """Return the id of the closest near-duplicate of a job dict, or None"""
+        entry = self._entry(job)
+        signature = entry['signature']
+
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            candidates.discard(exclude)
+
+            best_id, best_score = None, SIMILARITY_THRESHOLD
+            for candidate in candidates:
+                other = self._entries[candidate]
+                if (other['company'] != entry['company'] or other['location'] != entry['location']
+                        or not titles_match(other['title'], entry['title'])):
+                    continue
+                score = float(np.mean(other['signature'] == signature))
+                if score >= best_score:
+                    best_id, best_score = candidate, score
+        return best_id
+
+    def rebuild(self, jobs):
+        """Re-index every job dict from scratch"""
+        entries = {job['id']: self._entry(job) for job in jobs}
+        with self._lock:
+            self._entries = {}
+            self._buckets = {}
+            for job_id, entry in entries.items():
+                self._index(job_id, entry)
+            self.compact()
+
+    def _header(self):
+        return {'version': VERSION, 'num_perm': self.num_perm, 'bands': self.bands, 'seed': SEED}
+
+    @staticmethod
+    def _serialise(entry):
+        return {
+            'signature': entry['signature'].tolist(),
+            'company': entry['company'],
+            'location': entry['location'],
+            'title': entry['title'],
+        }
+
+    def _append(self, record):
+        if not self.path:
+            return
+        if not os.path.exists(self.path):
+            self.compact()
+            return
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def compact(self):
+        """Rewrite the log as a header plus one record per indexed job"""
+        if not self.path:
+            return
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + '.', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(json.dumps(self._header()) + '\n')
+                    for job_id, entry in self._entries.items():
+                        f.write(json.dumps({'op': 'add', 'id': job_id, **self._serialise(entry)}) + '\n')
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def load(self):
+        """Replay the persisted log; returns False if missing or incompatible"""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path) as f:
+                header = json.loads(f.readline() or 'null')
+                if header != self._header():
+                    return False
+
+                entries, records, torn = {}, 0, False
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        torn = True  # torn write; rewritten below so later appends aren't glued to it
+                        continue
+                    records += 1
+                    if record['op'] == 'remove':
+                        entries.pop(record['id'], None)
+                    else:
+                        entries[record['id']] = {
+                            'signature': np.array(record['signature'], dtype=np.uint64),
+                            'company': record['company'],
+                            'location': record['location'],
+                            'title': record['title'],
+                        }
+        except (OSError, ValueError, KeyError):
+            return False
+
+        with self._lock:
+            self._entries = {}
+            self._buckets = {}
+            for job_id, entry in entries.items():
+                self._index(job_id, entry)
+            if torn or records > COMPACT_FACTOR * len(entries):
+                self.compact()
+        return True
@@ -9,10 +9,12 @@ import time
 import json
 from datetime import datetime, date
 import re
+from dedup import DuplicateDetector
 
 class JobScraper:
     def __init__(self, api_base_url="http://localhost:5000/api"):
         self.api_base_url = api_base_url
+        self.duplicate_detector = None
         self.setup_driver()
     
     def setup_driver(self):
@@ -352,6 +354,7 @@ class JobScraper:
     def save_jobs_to_api(self, jobs):
         """Save scraped jobs to the Flask API"""
         saved_count = 0
+        self.load_duplicate_detector()
         
         for job in jobs:
             try:
@@ -360,7 +363,10 @@ class JobScraper:
                     response = requests.post(f"{self.api_base_url}/jobs", json=job, timeout=10)
                     if response.status_code == 201:
                         saved_count += 1
+                        self.duplicate_detector.add(response.json())
                         print(f"✅ Saved: {job['title']} at {job['company']}")
+                    elif response.status_code == 200:
+                        print(f"🔁 Merged into existing: {job['title']} at {job['company']}")
                     else:
                         print(f"❌ Failed to save: {job['title']} - {response.text}")
                 else:
@@ -371,19 +377,21 @@ class JobScraper:
         
         return saved_count
     
-    def job_exists(self, job):
-        """Check if job already exists in database"""
+    def load_duplicate_detector(self):
+        """Index existing jobs once per run for near-duplicate lookups"""
+        self.duplicate_detector = DuplicateDetector()
         try:
             response = requests.get(f"{self.api_base_url}/jobs", timeout=10)
             if response.status_code == 200:
-                existing_jobs = response.json()
-                for existing_job in existing_jobs:
-                    if (existing_job['title'].lower() == job['title'].lower() and 
-                        existing_job['company'].lower() == job['company'].lower()):
-                        return True
-            return False
-        except:
-            return False
+                self.duplicate_detector.rebuild(response.json())
+        except Exception as e:
+            print(f"⚠️ Could not load existing jobs for deduplication: {str(e)}")
+    
+    def job_exists(self, job):
+        """Check if job or a near-duplicate of it already exists in database"""
+        if self.duplicate_detector is None:
+            self.load_duplicate_detector()
+        return self.duplicate_detector.find_duplicate(job) is not None
     
     def run_scraper(self):
         """Main scraper function"""
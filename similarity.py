@@ -0,0 +1,210 @@
+"""
+Precomputed "similar jobs" index.
+
+Each job is encoded as an L2-normalised vector over its tags and title tokens,
+so cosine similarity is a plain dot product. Top-k neighbours for every job are
+computed in batch with NumPy and cached, which makes lookups a dictionary hit.
+Creating, updating or deleting a job only recomputes the rows it can affect.
+"""
+
+import ast
+import re
+import threading
+
+import numpy as np
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOPWORDS = {'a', 'an', 'and', 'at', 'for', 'in', 'of', 'the', 'to', 'with'}
+
+# Tags are curated, title tokens are noisy - weight them accordingly
+TAG_WEIGHT = 2.0
+TITLE_WEIGHT = 1.0
+
+# Rows of the similarity matrix computed at once during a rebuild
+BATCH_SIZE = 1024
+
+
+def parse_tags(tags):
+    """Parse the stringified tag list stored on Job.tags"""
+    if not tags:
+        return []
+    if isinstance(tags, (list, tuple)):
+        return list(tags)
+    try:
+        parsed = ast.literal_eval(tags)
+    except (ValueError, SyntaxError):
+        return []
+    return list(parsed) if isinstance(parsed, (list, tuple)) else []
+
+
+def job_features(title, tags):
+    """Return {feature: weight} for a job's title tokens and tags"""
+    features = {}
+    for tag in parse_tags(tags):
+        tag = ' '.join(TOKEN_RE.findall(str(tag).lower()))
+        if tag:
+            features['tag:' + tag] = TAG_WEIGHT
+    for token in TOKEN_RE.findall((title or '').lower()):
+        if token not in STOPWORDS:
+            features['title:' + token] = TITLE_WEIGHT
+    return features
+
+
+class SimilarityIndex:
+    def __init__(self, k=10):
+        if k < 1:
+            raise ValueError('k must be at least 1')
+        self.k = k
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._vocab = {}                                 # feature -> column
+        self._ids = []                                   # row -> job id
+        self._rows = {}                                  # job id -> row
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._nbr_rows = np.zeros((0, self.k), dtype=np.int64)
+        self._nbr_scores = np.zeros((0, self.k), dtype=np.float32)
+        self._neighbours = {}                            # job id -> [(id, score)]
+
+    def __contains__(self, job_id):
+        return job_id in self._rows
+
+    def __len__(self):
+        return len(self._ids)
+
+    def rebuild(self, jobs):
+        """Rebuild the whole index from an iterable of objects with id, title and tags"""
+        with self._lock:
+            self._reset()
+            jobs = list(jobs)
+            if not jobs:
+                return
+
+            rows, cols, weights = [], [], []
+            for row, job in enumerate(jobs):
+                self._rows[job.id] = row
+                self._ids.append(job.id)
+                for feature, weight in job_features(job.title, job.tags).items():
+                    rows.append(row)
+                    cols.append(self._vocab.setdefault(feature, len(self._vocab)))
+                    weights.append(weight)
+
+            matrix = np.zeros((len(jobs), len(self._vocab)), dtype=np.float32)
+            matrix[rows, cols] = weights
+            self._matrix = self._normalise(matrix)
+
+            n = len(jobs)
+            self._nbr_rows = np.full((n, self.k), -1, dtype=np.int64)
+            self._nbr_scores = np.zeros((n, self.k), dtype=np.float32)
+            self._recompute(np.arange(n))
+
+    def neighbours(self, job_id, limit=None):
+        """Return cached [(job_id, score)] for a job, most similar first"""
+        with self._lock:
+            neighbours = self._neighbours.get(job_id, [])
+        return neighbours if limit is None else neighbours[:max(limit, 0)]
+
+    def upsert(self, job):
+        """Add or refresh a single job and the neighbour lists it affects"""
+        with self._lock:
+            vector = self._encode(job)
+            row = self._rows.get(job.id)
+            if row is None:
+                row = len(self._ids)
+                self._rows[job.id] = row
+                self._ids.append(job.id)
+                self._matrix = np.vstack([self._matrix, vector])
+                self._nbr_rows = np.vstack([self._nbr_rows, np.full((1, self.k), -1, dtype=np.int64)])
+                self._nbr_scores = np.vstack([self._nbr_scores, np.zeros((1, self.k), dtype=np.float32)])
+            else:
+                self._matrix[row] = vector
+
+            # Rows that referenced the old vector, or that the new one now beats
+            scores = self._matrix @ vector
+            full = self._nbr_rows[:, -1] >= 0
+            floor = np.where(full, self._nbr_scores[:, -1], 0.0)
+            affected = (self._nbr_rows == row).any(axis=1) | (scores > floor)
+            affected[row] = True
+            self._recompute(np.flatnonzero(affected))
+
+    def remove(self, job_id):
+        """Drop a job and repair the neighbour lists that pointed at it"""
+        with self._lock:
+            row = self._rows.pop(job_id, None)
+            if row is None:
+                return
+            self._neighbours.pop(job_id, None)
+
+            # Move the last row into the hole so row numbers stay dense
+            last = len(self._ids) - 1
+            affected = (self._nbr_rows == row).any(axis=1)
+            if row != last:
+                moved_id = self._ids[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+                self._matrix[row] = self._matrix[last]
+                self._nbr_rows[row] = self._nbr_rows[last]
+                self._nbr_scores[row] = self._nbr_scores[last]
+                self._nbr_rows[self._nbr_rows == last] = row
+                affected[row] = affected[last]
+            self._ids.pop()
+            self._matrix = self._matrix[:last]
+            self._nbr_rows = self._nbr_rows[:last]
+            self._nbr_scores = self._nbr_scores[:last]
+            self._recompute(np.flatnonzero(affected[:last]))
+
+    def _encode(self, job):
+        features = job_features(job.title, job.tags)
+        for feature in features:
+            if feature not in self._vocab:
+                self._vocab[feature] = len(self._vocab)
+        if len(self._vocab) > self._matrix.shape[1]:
+            padding = len(self._vocab) - self._matrix.shape[1]
+            self._matrix = np.pad(self._matrix, ((0, 0), (0, padding)))
+
+        vector = np.zeros(len(self._vocab), dtype=np.float32)
+        if features:
+            vector[[self._vocab[f] for f in features]] = list(features.values())
+        return self._normalise(vector[np.newaxis, :])[0]
+
+    @staticmethod
+    def _normalise(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _recompute(self, rows):
+        """Recompute top-k neighbours for the given rows in batches"""
+        n = len(self._ids)
+        k = min(self.k, n - 1)
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start:start + BATCH_SIZE]
+            self._nbr_rows[batch] = -1
+            self._nbr_scores[batch] = 0.0
+            if k <= 0:
+                self._store(batch)
+                continue
+
+            scores = self._matrix[batch] @ self._matrix.T
+            scores[np.arange(len(batch)), batch] = -1.0  # never your own neighbour
+
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+            top[top_scores <= 0] = -1
+            top_scores[top_scores <= 0] = 0.0
+            self._nbr_rows[batch, :k] = top
+            self._nbr_scores[batch, :k] = top_scores
+            self._store(batch)
+
+    def _store(self, rows):
+        for row in rows:
+            self._neighbours[self._ids[row]] = [
+                (self._ids[other], float(score))
+                for other, score in zip(self._nbr_rows[row], self._nbr_scores[row])
+                if other >= 0
+            ]
@@ -0,0 +1,24 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# app.py configures the database at import time
+_tmp_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_tmp_dir, 'jobs.db')
+os.environ['DEDUP_INDEX_PATH'] = os.path.join(_tmp_dir, 'jobs.lsh.json')
+
+from app import app, db, Job, duplicate_detector, similar_jobs_index  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    with app.app_context():
+        Job.query.delete()
+        db.session.commit()
+        similar_jobs_index.rebuild([])
+        duplicate_detector.rebuild([])
+    return app.test_client()
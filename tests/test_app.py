@@ -0,0 +1,51 @@
+import app as app_module
+
+JOB = {
+    'title': 'Senior Life Insurance Actuary',
+    'company': 'MetLife',
+    'location': 'New York, NY',
+    'tags': ['Life Insurance'],
+}
+
+
+def test_create_job_merges_near_duplicate(client):
+    created = client.post('/api/jobs', json=JOB)
+    assert created.status_code == 201
+
+    repost = client.post('/api/jobs', json={**JOB, 'title': 'Sr. Life Actuary', 'tags': ['Pricing'], 'salary': '$1'})
+    assert repost.status_code == 200
+    assert repost.json['duplicate_of'] == created.json['id']
+    assert repost.json['tags'] == ['Life Insurance', 'Pricing']
+    assert repost.json['salary'] == '$1'
+    assert len(client.get('/api/jobs').json) == 1
+
+
+def test_create_job_keeps_other_locations(client):
+    assert client.post('/api/jobs', json=JOB).status_code == 201
+    assert client.post('/api/jobs', json={**JOB, 'location': 'Chicago, IL'}).status_code == 201
+
+
+def test_create_job_survives_index_failure(client, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('index unavailable')
+
+    monkeypatch.setattr(app_module.duplicate_detector, 'add', fail)
+    response = client.post('/api/jobs', json=JOB)
+    assert response.status_code == 201
+    assert len(client.get('/api/jobs').json) == 1
+
+
+def test_create_job_merges_repost_with_null_tags(client):
+    assert client.post('/api/jobs', json={**JOB, 'tags': None}).status_code == 201
+    assert client.post('/api/jobs', json={**JOB, 'tags': None}).status_code == 200
+
+
+def test_create_job_allow_duplicate_bypasses_merge(client):
+    assert client.post('/api/jobs', json=JOB).status_code == 201
+    assert client.post('/api/jobs?allow_duplicate=1', json=JOB).status_code == 201
+    assert len(client.get('/api/jobs').json) == 2
+
+
+def test_create_job_validates_before_merging(client):
+    assert client.post('/api/jobs', json=JOB).status_code == 201
+    assert client.post('/api/jobs', json={**JOB, 'posting_date': '18/10/2026'}).status_code == 400
@@ -0,0 +1,119 @@
+import json
+import os
+
+import pytest
+
+from dedup import DuplicateDetector, normalise_company
+
+EXISTING = {'id': 1, 'title': 'Senior Pricing Actuary', 'company': 'MetLife', 'location': 'New York, NY'}
+
+
+@pytest.fixture
+def detector():
+    detector = DuplicateDetector()
+    detector.add(EXISTING)
+    return detector
+
+
+@pytest.mark.parametrize('changes', [
+    {'title': 'Junior Pricing Actuary'},
+    {'title': 'Senior Pricing Analyst'},
+    {'title': 'Pricing Actuary'},
+    {'location': 'Chicago, IL'},
+    {'location': 'London, UK', 'description': 'Lead the pricing team for our UK motor book.'},
+    {'company': 'Prudential'},
+    {'title': 'Senior Pricing Actuary - Commercial Lines'},
+])
+def test_different_jobs_are_not_duplicates(detector, changes):
+    assert detector.find_duplicate({**EXISTING, **changes}) is None
+
+
+def test_identical_job_is_duplicate(detector):
+    assert detector.find_duplicate({**EXISTING, 'id': 2}) == 1
+    assert detector.find_duplicate(EXISTING, exclude=1) is None
+
+
+def test_abbreviated_repost_with_different_description_is_duplicate():
+    detector = DuplicateDetector()
+    detector.add({
+        'id': 1,
+        'title': 'Senior Life Insurance Actuary',
+        'company': 'MetLife',
+        'location': 'New York, NY',
+        'description': "Join MetLife as a Senior Life Insurance Actuary and contribute to our dynamic "
+                       "actuarial team. This role offers excellent opportunities for professional growth.",
+    })
+    repost = {
+        'title': 'Sr. Life Actuary',
+        'company': 'MetLife Inc.',
+        'location': 'New York, NY',
+        'description': "We are seeking a talented Sr. Life Actuary to join MetLife Inc.'s innovative team. "
+                       "You'll work on challenging projects and make a meaningful impact.",
+    }
+    assert detector.find_duplicate(repost) == 1
+
+
+def test_titles_differing_in_substantive_words_are_not_duplicates():
+    detector = DuplicateDetector()
+    job = {'company': 'MetLife', 'location': 'New York, NY'}
+    detector.add({**job, 'id': 1, 'title': 'Senior Actuarial Analyst - Commercial Property Lines'})
+    assert detector.find_duplicate({**job, 'title': 'Senior Actuarial Analyst - Personal Property Lines'}) is None
+
+
+def test_normalise_company_strips_legal_suffixes():
+    assert normalise_company('MetLife Inc.') == 'metlife'
+    assert normalise_company('Swiss Re Ltd') == 'swiss re'
+    assert normalise_company('Munich Re Corp') == normalise_company('munich re')
+
+
+def test_log_is_appended_and_replayed(tmp_path):
+    path = str(tmp_path / 'jobs.lsh.json')
+    detector = DuplicateDetector(path)
+    detector.rebuild([EXISTING])
+    detector.add({**EXISTING, 'id': 2, 'location': 'Chicago, IL'})
+    detector.remove(1)
+
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert [line.get('op') for line in lines] == [None, 'add', 'add', 'remove']
+    assert all('buckets' not in line for line in lines)
+
+    reloaded = DuplicateDetector(path)
+    assert reloaded.load()
+    assert reloaded.ids() == {2}
+    assert reloaded.find_duplicate({**EXISTING, 'location': 'Chicago, IL'}) == 2
+    assert os.listdir(tmp_path) == ['jobs.lsh.json']
+
+
+def test_load_compacts_stale_log(tmp_path):
+    path = str(tmp_path / 'jobs.lsh.json')
+    detector = DuplicateDetector(path)
+    detector.rebuild([])
+    for _ in range(3):
+        detector.add(EXISTING)
+
+    assert DuplicateDetector(path).load()
+    with open(path) as f:
+        assert len(f.readlines()) == 2
+
+
+def test_load_rejects_incompatible_file(tmp_path):
+    path = tmp_path / 'jobs.lsh.json'
+    path.write_text(json.dumps({'num_perm': 128, 'bands': 32, 'seed': 1, 'entries': {}, 'buckets': {}}))
+    assert not DuplicateDetector(str(path)).load()
+
+
+def test_load_repairs_torn_write(tmp_path):
+    path = str(tmp_path / 'jobs.lsh.json')
+    detector = DuplicateDetector(path)
+    detector.rebuild([EXISTING])
+    with open(path, 'a') as f:
+        f.write('{"op": "add", "id": 2, "signa')
+
+    reloaded = DuplicateDetector(path)
+    assert reloaded.load()
+    reloaded.add({**EXISTING, 'id': 3, 'location': 'Chicago, IL'})
+
+    again = DuplicateDetector(path)
+    assert again.load()
+    assert again.ids() == {1, 3}
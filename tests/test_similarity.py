@@ -0,0 +1,81 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from similarity import SimilarityIndex
+
+WORDS = ['life', 'senior', 'actuary', 'pricing', 'health', 'risk', 'analyst', 'chief', 'data']
+TAGS = ['Excel', 'SQL', 'Python', 'Pricing', 'Reserving', 'Healthcare', 'FSA', 'ASA']
+
+
+def test_incremental_updates_match_rebuild():
+    rnd = random.Random(0)
+    jobs = {}
+    index = SimilarityIndex(k=4)
+
+    def make(job_id):
+        return SimpleNamespace(id=job_id, title=' '.join(rnd.sample(WORDS, 3)), tags=str(rnd.sample(TAGS, 2)))
+
+    for step in range(300):
+        op = rnd.random()
+        if op < 0.5 or not jobs:
+            jobs[step] = make(step)
+            index.upsert(jobs[step])
+        elif op < 0.8:
+            job_id = rnd.choice(list(jobs))
+            jobs[job_id] = make(job_id)
+            index.upsert(jobs[job_id])
+        else:
+            job_id = rnd.choice(list(jobs))
+            del jobs[job_id]
+            index.remove(job_id)
+
+        rebuilt = SimilarityIndex(k=4)
+        rebuilt.rebuild(jobs.values())
+        for job_id in jobs:
+            incremental = [round(score, 4) for _, score in index.neighbours(job_id)]
+            expected = [round(score, 4) for _, score in rebuilt.neighbours(job_id)]
+            assert incremental == expected
+
+
+def test_neighbours_limit():
+    index = SimilarityIndex(k=3)
+    index.rebuild([SimpleNamespace(id=i, title='Pricing Actuary', tags="['Pricing']") for i in range(5)])
+    assert len(index.neighbours(0)) == 3
+    assert len(index.neighbours(0, 2)) == 2
+    assert index.neighbours(0, 0) == []
+
+
+def test_index_rejects_k_below_one():
+    with pytest.raises(ValueError):
+        SimilarityIndex(k=0)
+
+
+def _create(client, title, tags):
+    return client.post('/api/jobs', json={'title': title, 'company': 'X', 'location': 'Remote', 'tags': tags}).json['id']
+
+
+def test_similar_jobs_endpoint(client):
+    life = _create(client, 'Senior Life Actuary', ['Life Insurance', 'Pricing'])
+    close = _create(client, 'Life Insurance Actuary', ['Life Insurance', 'Pricing'])
+    far = _create(client, 'Pricing Analyst', ['Pricing'])
+    _create(client, 'Healthcare Data Scientist', ['Healthcare'])
+
+    response = client.get(f'/api/jobs/{life}/similar')
+    assert response.status_code == 200
+    assert [job['id'] for job in response.json] == [close, far]
+    assert response.json[0]['similarity'] > response.json[1]['similarity']
+
+    assert [job['id'] for job in client.get(f'/api/jobs/{life}/similar?limit=1').json] == [close]
+    assert len(client.get(f'/api/jobs/{life}/similar?limit=1000').json) == 2
+
+    client.delete(f'/api/jobs/{close}')
+    assert [job['id'] for job in client.get(f'/api/jobs/{life}/similar').json] == [far]
+
+
+def test_similar_jobs_endpoint_rejects_bad_limit(client):
+    job_id = _create(client, 'Senior Life Actuary', ['Life Insurance'])
+    assert client.get(f'/api/jobs/{job_id}/similar?limit=0').status_code == 400
+    assert client.get(f'/api/jobs/{job_id}/similar?limit=-1').status_code == 400
+    assert client.get('/api/jobs/999/similar').status_code == 404